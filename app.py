@@ -1,83 +1,266 @@
-import streamlit as st 
-from langchain_openai import ChatOpenAI
+import re
+from collections import deque
 
-from langchain.prompts import (
-    ChatPromptTemplate,
-    SystemMessagePromptTemplate,
-    HumanMessagePromptTemplate
-)
+import streamlit as st
 
+from app_config import (
+    PAGE_TITLE,
+    PAGE_ICON,
+    OPENAI_MODEL_NAME,
+    OPENAI_TEMPERATURE,
+    OPENAI_API_KEY_PROMPT,
+    INGREDIENTS_PLACEHOLDER,
+    INGREDIENTS_PROMPT,
+    APPLIANCE_PROMPT,
+    SUBMIT_BUTTON_LABEL,
+    DEFAULT_APPLIANCE_INDEX,
+    GENERATION_ERROR_MESSAGE,
+    MAX_PROMPT_INGREDIENTS,
+    RECIPE_HISTORY_LIMIT,
+    SUPPORTED_APPLIANCES,
+    SUPPORTED_APPLIANCES_SET,
+)
+from models import RecipeRequest
 from prompts import system_prompt, user_prompt
 
-# Constants
-PAGE_TITLE = "Recipe AI"
-PAGE_ICON = "🍲"
-OPENAI_MODEL_NAME = "gpt-4"
-OPENAI_API_KEY_PROMPT = 'OpenAI API Key'
+# Rejects obviously malformed keys before a doomed (and slow) LLM call.
+_OPENAI_KEY_RE = re.compile(r'^sk-[A-Za-z0-9_\-]{20,}$')
 
+# Splits comma-separated ingredients and eats surrounding whitespace in one pass.
+_CSV_SPLIT = re.compile(r'\s*,\s*')
 
+# Collapses the runs of blank lines the model sometimes emits between sections.
+_EXCESS_BLANK_LINES = re.compile(r'\n{3,}')
 
-# Set page config
-st.set_page_config(page_title=PAGE_TITLE, page_icon=PAGE_ICON, initial_sidebar_state="collapsed")
-st.header("",divider='orange')
-st.title(f"🍲 :orange[_{PAGE_TITLE}_] | Easy-to-make recipes")
-st.header("",divider='orange')
+# Drops bullet characters pasted in from formatted lists, in one C-level scan.
+_BULLET_TRANS = str.maketrans('', '', '•')
 
-# Get OpenAI API key
-openai_api_key = st.sidebar.text_input(OPENAI_API_KEY_PROMPT, type='password')
 
-if not openai_api_key.startswith('sk-'):
-    st.info("Please add your OpenAI API key in the sidebar to continue.")
-    st.stop()
+@st.cache_data(show_spinner=False)
+def get_appliance_options() -> tuple[str, ...]:
+    return SUPPORTED_APPLIANCES
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_client():
+    # One pooled client shared by every cached ChatOpenAI, so new API keys
+    # or models reuse warm TCP/TLS connections instead of opening a fresh
+    # pool. HTTP/2 keeps a single multiplexed TLS session across calls.
+    import httpx
+
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_chat_model(openai_api_key: str, model_name: str):
+    # Deferred import: langchain_openai is heavy and only needed on submit.
+    from langchain_openai import ChatOpenAI
+
+    # Temperature stays out of the cache key on purpose: the app runs a
+    # single client per (key, model), and per-call overrides can use .bind.
+    return ChatOpenAI(
+        model_name=model_name,
+        temperature=OPENAI_TEMPERATURE,
+        openai_api_key=openai_api_key,
+        http_client=get_http_client(),
+    )
+
+
+def build_request_messages(recipe_request: RecipeRequest):
+    # user_prompt only has {ingredients}/{helper} substitutions, so two plain
+    # messages and one str.format beat the ChatPromptTemplate machinery.
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    user_message = user_prompt.format(
+        ingredients=', '.join(recipe_request.ingredients),
+        helper=recipe_request.appliance,
+    )
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_message)]
+
+
+# Factories rather than values, so each session gets its own containers.
+# recipe_history is a deque: it drops the oldest recipe in O(1) at capacity.
+_SESSION_DEFAULTS = {
+    "recipe_history": lambda: deque(maxlen=RECIPE_HISTORY_LIMIT),
+    "_pending_ingredients": tuple,
+    "_recipe_cache": dict,
+}
+
+
+def setup_page_config() -> None:
+    # st.set_page_config only takes effect once per session; skip the call
+    # (and its must-be-first-command guard) entirely on later reruns.
+    if st.session_state.get("_page_configured"):
+        return
+    st.set_page_config(page_title=PAGE_TITLE, page_icon=PAGE_ICON, initial_sidebar_state="collapsed")
+    st.session_state["_page_configured"] = True
+
+
+def initialize_session_state() -> None:
+    for key, default in _SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = default()
+
+
+def generate_recipe(chat, recipe_request: RecipeRequest) -> str:
+    # Exact-match response cache, session-scoped (rather than st.cache_data)
+    # so that cache misses can stream to the page token by token. Sorting the
+    # ingredients makes the key order-insensitive: "milk, oats" and
+    # "oats, milk" share one entry.
+    key = (
+        tuple(sorted(recipe_request.ingredients, key=str.lower)),
+        recipe_request.appliance,
+        OPENAI_MODEL_NAME,
+    )
+    cache = st.session_state["_recipe_cache"]
+
+    if key in cache:
+        content = cache[key]
+        # Cache hit: rule, heading, recipe, and closing rule in one element.
+        st.markdown(f"---\n### Recipe\n{content}\n\n---")
+        return content
+
+    st.markdown("---\n### Recipe")
+
+    request = build_request_messages(recipe_request)
 
-with st.sidebar:
-        
-    st.divider()
-    
-    st.write('*Your cooking adventure begins with whatever ingredients you have readily available.*')
-    st.caption('''**That's why I'd love for you to list the ingredients. 
-               Once we have it, we'll understand it and start exploring our options.
-                Then, we'll work together to and come up with the best possible recipe.  
-                Sounds fun, right?**
-    ''')
+    content = st.write_stream(chunk.content for chunk in chat.stream(request))
+    # Tidy once after streaming; cache hits and history replays reuse it.
+    content = _EXCESS_BLANK_LINES.sub('\n\n', content)
+    cache[key] = content
 
-    st.divider()
+    st.markdown("---")
+    return content
 
 
-# Form inputs
-with st.form("cooking_list"):
+@st.cache_data(show_spinner=False, max_entries=64)
+def parse_ingredients(raw: str) -> tuple[str, ...]:
+    # Split, then case-insensitively de-duplicate in a single pass; the
+    # tuple result hashes straight into the response-cache key, so inputs
+    # differing only in repeats hit the same cached recipe.
+    seen = set()
+    out = []
+    for part in _CSV_SPLIT.split(raw.translate(_BULLET_TRANS).strip()):
+        lowered = part.lower()
+        if part and lowered not in seen:
+            seen.add(lowered)
+            out.append(part)
+            if len(out) == MAX_PROMPT_INGREDIENTS:
+                break
+    return tuple(out)
 
-    ingredients_input = st.text_input(
-            "What do we have with us?",
-            placeholder= "Blueberries, oats, milk, honey, walnuts",
+
+def render_api_configuration() -> None:
+    st.sidebar.text_input(OPENAI_API_KEY_PROMPT, type='password', key="openai_api_key")
+
+    with st.sidebar:
+
+        st.divider()
+
+        st.write('*Your cooking adventure begins with whatever ingredients you have readily available.*')
+        st.caption('''**That's why I'd love for you to list the ingredients.
+                Once we have it, we'll understand it and start exploring our options.
+                    Then, we'll work together to and come up with the best possible recipe.
+                    Sounds fun, right?**
+        ''')
+
+        st.divider()
+
+
+def render_recipe_form() -> bool:
+    with st.form("cooking_list"):
+
+        ingredients_input = st.text_input(
+                INGREDIENTS_PROMPT,
+                placeholder=INGREDIENTS_PLACEHOLDER,
+                key="ingredients_input",
+            )
+
+        kitchen_appliance = st.selectbox(
+            APPLIANCE_PROMPT,
+            get_appliance_options(),
+            index=DEFAULT_APPLIANCE_INDEX,
+            key="kitchen_appliance",
+        )
+        ingredients = parse_ingredients(ingredients_input)
+
+        st.markdown(
+            f"- Current ingredients are: {', '.join(ingredients)}\n"
+            f"- And you would like to use {kitchen_appliance}"
         )
 
-    kitchen_appliance = st.radio(
-        "What is your favorite kitchen appliance?",
-        ["Oven", "Microwave", "Toaster", "Food processor", "Blender", "Air Fryer", "Pressure Cooker", "Cooktop"],
-        index=0,
+        submitted = st.form_submit_button(SUBMIT_BUTTON_LABEL)
+
+    # The widgets persist their own values via their keys; only the parsed
+    # tuple needs an explicit stash for the submit path.
+    st.session_state["_pending_ingredients"] = ingredients
+
+    return submitted
+
+
+def render_generated_recipe() -> None:
+    if st.session_state["kitchen_appliance"] not in SUPPORTED_APPLIANCES_SET:
+        st.error("Please pick a supported kitchen appliance.")
+        return
+
+    # Cheap check before the expensive call: an empty ingredient list can
+    # only produce a useless recipe, so don't spend an LLM round-trip on it.
+    if not st.session_state["_pending_ingredients"]:
+        st.warning("Please list at least one ingredient before asking for a recipe.")
+        return
+
+    recipe_request = RecipeRequest(
+        ingredients=st.session_state["_pending_ingredients"],
+        appliance=st.session_state["kitchen_appliance"],
     )
-    st.write('Current ingredients are:', ingredients_input)
-    st.write("And you would like to use ", kitchen_appliance)
-    
-    submitted = st.form_submit_button("Give me a recipe!")
+
+    # Deferred like the other LLM imports; only needed for its error types.
+    import openai
+
+    chat = get_chat_model(st.session_state["openai_api_key"], OPENAI_MODEL_NAME)
+
+    try:
+        content = generate_recipe(chat, recipe_request)
+    except openai.OpenAIError:
+        # API failures (bad key, rate limit, connectivity) get the friendly
+        # message; anything else propagates with its original traceback.
+        st.error(GENERATION_ERROR_MESSAGE)
+        return
+
+    st.session_state["recipe_history"].append((recipe_request, content))
+
+
+def render_recipe_history() -> None:
+    history = st.session_state["recipe_history"]
+    if not history:
+        return
+
+    st.subheader("Previous recipes")
+    for number, (recipe_request, content) in enumerate(history, start=1):
+        with st.expander(f"Recipe {number}: {recipe_request.label()}"):
+            st.write(content)
 
 
+# Set page config
+setup_page_config()
+st.header("",divider='orange')
+st.title(f"🍲 :orange[_{PAGE_TITLE}_] | Easy-to-make recipes")
+st.header("",divider='orange')
 
-if submitted: 
-    system_message_prompt = SystemMessagePromptTemplate.from_template(system_prompt)
-    human_message_prompt = HumanMessagePromptTemplate.from_template(user_prompt)
-    chat_prompt = ChatPromptTemplate.from_messages([system_message_prompt, human_message_prompt])
-    
-    request = chat_prompt.format_prompt(ingredients=ingredients_input, helper=kitchen_appliance).to_messages()
+initialize_session_state()
+
+render_api_configuration()
+
+if _OPENAI_KEY_RE.match(st.session_state["openai_api_key"]) is None:
+    st.info("Please add your OpenAI API key in the sidebar to continue.")
+    st.stop()
 
-    st.divider()
-    
-    st.subheader("Recipe: ")
-    with st.spinner('Please wait...'):
-        chat = ChatOpenAI(model_name=OPENAI_MODEL_NAME, temperature=0.5, openai_api_key=openai_api_key)
+submitted = render_recipe_form()
 
-        result = chat(request)
+if submitted:
+    render_generated_recipe()
 
-        st.write(result.content)
-        st.divider()
\ No newline at end of file
+render_recipe_history()
@@ -0,0 +1,38 @@
+# Shared application configuration. Everything here is immutable: tuples and
+# frozensets instead of lists, annotated Final so nothing mutates at runtime.
+
+from typing import Final
+
+PAGE_TITLE: Final = "Recipe AI"
+PAGE_ICON: Final = "🍲"
+OPENAI_MODEL_NAME: Final = "gpt-4"
+OPENAI_TEMPERATURE: Final = 0.5
+OPENAI_API_KEY_PROMPT: Final = 'OpenAI API Key'
+
+SUPPORTED_APPLIANCES: Final[tuple[str, ...]] = ("Oven", "Microwave", "Toaster", "Food processor", "Blender", "Air Fryer", "Pressure Cooker", "Cooktop")
+
+# Frozenset companion for O(1) membership checks; the tuple keeps UI ordering.
+SUPPORTED_APPLIANCES_SET: Final = frozenset(SUPPORTED_APPLIANCES)
+
+RECIPE_HISTORY_LIMIT: Final = 10
+
+# Upper bound on ingredients fed to the prompt; anything beyond this adds
+# tokens (and prefill time) without improving the recipe.
+MAX_PROMPT_INGREDIENTS: Final = 25
+
+EXAMPLE_INGREDIENTS: Final[tuple[str, ...]] = ("Blueberries", "oats", "milk", "honey", "walnuts")
+
+# Joined once at import time; used as the ingredients placeholder on every rerun.
+INGREDIENTS_PLACEHOLDER: Final = ", ".join(EXAMPLE_INGREDIENTS)
+
+# Shown on the error path instead of a traceback; built once at import.
+GENERATION_ERROR_MESSAGE: Final = (
+    "Something went wrong while generating your recipe. "
+    "Please check your API key and try again in a moment."
+)
+
+# Form labels and defaults.
+INGREDIENTS_PROMPT: Final = "What do we have with us?"
+APPLIANCE_PROMPT: Final = "What is your favorite kitchen appliance?"
+SUBMIT_BUTTON_LABEL: Final = "Give me a recipe!"
+DEFAULT_APPLIANCE_INDEX: Final = 0
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class RecipeRequest:
+    # Immutable snapshot of one submission; hashable, so it can key caches.
+    ingredients: tuple[str, ...]
+    appliance: str
+
+    def label(self) -> str:
+        return f"{', '.join(self.ingredients)} ({self.appliance})"
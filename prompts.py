@@ -1,12 +1,17 @@
-system_prompt = '''Act as an expert in creating delicious and nutritious recipes that are easy to make and use readily available ingredients in any household. '''
+# The static pieces below are joined once at import time; only user_prompt
+# contains per-request placeholders.
+_PERSONA = '''Act as an expert in creating delicious and nutritious recipes that are easy to make and use readily available ingredients in any household.
+The recipe can also use additional ingredients that are readily available and also the nutrition breakdown.'''
 
-user_prompt = '''Can you please come up with a recipe using the following ingredients: 
-{ingredients}
-Also, the recipe has to use {helper}.
-The recipe can also use additional ingredients that are readily available and also the nutrition breakdown. 
-Use the following format to give the results 
-Mention what we are making first and a few words describing it. 
+_FORMAT_INSTRUCTIONS = '''Use the following format to give the results
+Mention what we are making first and a few words describing it.
 Ingredients used.
-The recipe. 
-Some additional enhancements can be made.   
-Make the results fun to read and use emojis.'''
\ No newline at end of file
+The recipe.
+Some additional enhancements can be made.
+Make the results fun to read and use emojis.'''
+
+system_prompt = f'{_PERSONA}\n{_FORMAT_INSTRUCTIONS}'
+
+user_prompt = '''Can you please come up with a recipe using the following ingredients:
+{ingredients}
+Also, the recipe has to use {helper}.'''